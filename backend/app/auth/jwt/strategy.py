@@ -1,13 +1,76 @@
+import hashlib
+import time
+from typing import Optional
+import jwt
+from jwt import PyJWK
+from jwt.utils import base64url_encode
+from pydantic import SecretStr
+from fastapi_users import BaseUserManager, exceptions
 from fastapi_users.authentication import JWTStrategy
-from fastapi_users.jwt import generate_jwt
-import os
-from dotenv import load_dotenv
+from fastapi_users.jwt import SecretType, generate_jwt
+from app.core.config import JWT_LIFETIME_SECONDS, JWT_SECRET
+from app.core.ttl_cache import TTLCache
 from app.models.user_model import User
 
 
+# verified tokens, so repeated requests skip the signature check
+token_cache = TTLCache(maxsize=10000, ttl=5)
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()[:16]
+
+
+def _prepare_verify_key(key: SecretType, algorithm: str) -> SecretType | PyJWK:
+    # pyjwt re-prepares a raw secret on every decode, a PyJWK carries the prepared key
+    if not algorithm.startswith("HS"):
+        return key
+    secret = key.get_secret_value() if isinstance(key, SecretStr) else key
+    return PyJWK.from_dict(
+        {"kty": "oct", "k": base64url_encode(secret.encode()).decode(), "alg": algorithm}
+    )
 
 
 class RoleJWTStrategy(JWTStrategy):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._verify_key = _prepare_verify_key(self.decode_key, self.algorithm)
+
+    async def read_token(
+        self, token: Optional[str], user_manager: BaseUserManager[User, str]
+    ) -> Optional[User]:
+        if token is None:
+            return None
+
+        cache_key = _token_key(token)
+        user_id = token_cache.get(cache_key)
+        if user_id is None:
+            try:
+                data = jwt.decode(
+                    token,
+                    self._verify_key,
+                    audience=self.token_audience,
+                    algorithms=[self.algorithm],
+                )
+            except jwt.PyJWTError:
+                return None
+
+            user_id = data.get("sub")
+            if user_id is None:
+                return None
+            try:
+                user_id = user_manager.parse_id(user_id)
+            except exceptions.InvalidID:
+                return None
+            # cache the parsed id so hits skip the UUID parse as well, never past the token's exp
+            exp = data.get("exp")
+            token_cache.set(cache_key, user_id, None if exp is None else exp - time.time())
+
+        try:
+            return await user_manager.get(user_id)
+        except exceptions.UserNotExists:
+            return None
+
     async def write_token(self, user: User) -> str:
         data = {"sub": str(user.id), "aud": self.token_audience}
         # data = {"sub" : str(user.id), "aud":self.token_audience, "role" : user.role, "email" : user.email}
@@ -15,9 +78,18 @@ class RoleJWTStrategy(JWTStrategy):
             data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm
         )
 
+    async def destroy_token(self, token: str, user: User) -> None:
+        # the JWT itself stays valid until it expires, but stop serving it from the cache
+        token_cache.pop(_token_key(token))
+        await super().destroy_token(token, user)
+
+
+# the strategy holds no per-request state, so build it once
+jwt_strategy = RoleJWTStrategy(
+    secret=JWT_SECRET,
+    lifetime_seconds=JWT_LIFETIME_SECONDS
+)
+
 
-def get_jwt_strategy() -> RoleJWTStrategy:
-    return RoleJWTStrategy(
-        secret=os.getenv("JWT_SECRET", "SUPER_SECRET_JWT_KEY"),
-        lifetime_seconds=3600
-    )
\ No newline at end of file
+async def get_jwt_strategy() -> RoleJWTStrategy:
+    return jwt_strategy
@@ -1,22 +1,94 @@
-from fastapi import Depends
-from fastapi_users import BaseUserManager, UUIDIDMixin
+from concurrent.futures import Executor
+from typing import Any, Optional
+from fastapi import Depends, Request
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi_users import BaseUserManager, UUIDIDMixin, exceptions, schemas
+from fastapi_users.password import PasswordHelperProtocol
+from app.auth.password import hash_password, password_helper, verify_and_update_password
+from app.core.config import JWT_SECRET
 from app.db.base_db import get_async_db_session
+from app.db.user_db import UserDatabase
 from app.models.user_model import User
-from dotenv import load_dotenv
-import os
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
-
-SECRET = os.getenv("JWT_SECRET", "dev-secret-key")
 
 
 class UserManager(UUIDIDMixin, BaseUserManager[User, str]):
-    reset_password_token_secret = SECRET
-    verification_token_secret = SECRET
+    reset_password_token_secret = JWT_SECRET
+    verification_token_secret = JWT_SECRET
+
+    def __init__(
+        self,
+        user_db: UserDatabase,
+        password_helper: PasswordHelperProtocol,
+        password_pool: Executor,
+    ):
+        super().__init__(user_db, password_helper)
+        self.password_pool = password_pool
+
+    # same as BaseUserManager.create / authenticate, but hashing runs in the password pool
+
+    async def create(
+        self,
+        user_create: schemas.UC,
+        safe: bool = False,
+        request: Optional[Request] = None,
+    ) -> User:
+        await self.validate_password(user_create.password, user_create)
+
+        # repeated signups for a taken email shouldn't cost an argon2 hash each
+        if self.user_db.email_recently_registered(user_create.email):
+            raise exceptions.UserAlreadyExists()
+
+        user_dict = (
+            user_create.create_update_dict()
+            if safe
+            else user_create.create_update_dict_superuser()
+        )
+        password = user_dict.pop("password")
+        user_dict["hashed_password"] = await hash_password(self.password_pool, password)
+
+        # no exists query, the insert itself reports a taken email
+        created_user = await self.user_db.create_if_new(user_dict)
+        if created_user is None:
+            raise exceptions.UserAlreadyExists()
+
+        await self.on_after_register(created_user, request)
+        return created_user
+
+    async def authenticate(self, credentials: OAuth2PasswordRequestForm) -> Optional[User]:
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # hash anyway so unknown emails take as long as wrong passwords
+            await hash_password(self.password_pool, credentials.password)
+            return None
+
+        verified, updated_password_hash = await verify_and_update_password(
+            self.password_pool, credentials.password, user.hashed_password
+        )
+        if not verified:
+            return None
+
+        if updated_password_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_password_hash})
+
+        return user
 
+    async def _update(self, user: User, update_dict: dict[str, Any]) -> User:
+        # PATCH /me and /{id} hash here, take the password out before the base class hashes it inline
+        update_dict = dict(update_dict)  # update() still hands the original to on_after_update
+        password = update_dict.pop("password", None)
+        if password is not None:
+            await self.validate_password(password, user)
+            update_dict["hashed_password"] = await hash_password(self.password_pool, password)
+        return await super()._update(user, update_dict)
 
-async def get_user_db(db_session: AsyncSession = Depends(get_async_db_session)):
-    yield SQLAlchemyUserDatabase(db_session, User)
 
-async def get_user_manager(user_db=Depends(get_user_db)):
-    yield UserManager(user_db)
\ No newline at end of file
+# one dependency for the db adapter and the manager, both are tied to the request session.
+# the password pool is per worker and lives on app.state next to the engine
+async def get_user_manager(
+    request: Request, db_session: AsyncSession = Depends(get_async_db_session)
+):
+    yield UserManager(
+        UserDatabase(db_session, User), password_helper, request.app.state.password_pool
+    )
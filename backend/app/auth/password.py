@@ -0,0 +1,39 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from fastapi_users.password import PasswordHelper
+from app.core.config import PASSWORD_HASH_WORKERS
+
+password_helper = PasswordHelper()
+
+
+def create_password_pool() -> ProcessPoolExecutor:
+    # password hashing is CPU bound, keep it off the event loop and the request threadpool.
+    # forkserver children start clean instead of forking a worker with a running event loop
+    # and open db connections; they only import this module to unpickle _hash/_verify_and_update
+    return ProcessPoolExecutor(
+        max_workers=PASSWORD_HASH_WORKERS,
+        mp_context=multiprocessing.get_context("forkserver"),
+    )
+
+
+def _hash(password: str) -> str:
+    return password_helper.hash(password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return password_helper.verify_and_update(plain_password, hashed_password)
+
+
+async def hash_password(pool: Executor, password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, _hash, password)
+
+
+async def verify_and_update_password(
+    pool: Executor, plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        pool, _verify_and_update, plain_password, hashed_password
+    )
@@ -0,0 +1,42 @@
+import os
+from dotenv import load_dotenv
+
+# read the environment once at import, everything else imports the values from here
+load_dotenv()
+
+JWT_SECRET = os.getenv("JWT_SECRET", "SUPER_SECRET_JWT_KEY")
+JWT_LIFETIME_SECONDS = int(os.getenv("JWT_LIFETIME_SECONDS", "3600"))
+
+# uvicorn workers, ignored when RELOAD is on (reload runs a single process)
+WORKERS = int(os.getenv("WORKERS", str(os.cpu_count() or 1)))
+RELOAD = os.getenv("RELOAD", "false").lower() == "true"
+_PROCESSES = 1 if RELOAD else WORKERS
+
+DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://localhost:5432/pro_trader")
+# connections for the whole server, split between the workers. keep it under postgres' max_connections
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "80"))
+_DB_CONNECTIONS_PER_WORKER = max(2, DB_MAX_CONNECTIONS // _PROCESSES)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", str(_DB_CONNECTIONS_PER_WORKER // 2)))
+# never let the default go negative, sqlalchemy reads max_overflow=-1 as unlimited
+DB_MAX_OVERFLOW = int(
+    os.getenv("DB_MAX_OVERFLOW", str(max(0, _DB_CONNECTIONS_PER_WORKER - DB_POOL_SIZE)))
+)
+if DB_POOL_SIZE < 1 or DB_MAX_OVERFLOW < 0:
+    raise ValueError("DB_POOL_SIZE must be at least 1 and DB_MAX_OVERFLOW at least 0")
+if DB_POOL_SIZE + DB_MAX_OVERFLOW > _DB_CONNECTIONS_PER_WORKER:
+    raise ValueError(
+        f"DB_POOL_SIZE + DB_MAX_OVERFLOW ({DB_POOL_SIZE} + {DB_MAX_OVERFLOW}) is over the "
+        f"per-worker budget of {_DB_CONNECTIONS_PER_WORKER} (DB_MAX_CONNECTIONS / WORKERS)"
+    )
+# recycle before server/proxy idle timeouts drop connections under us
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+# fail fast when the pool is exhausted instead of waiting the default 30s
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "2.0"))
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+
+# argon2 processes per worker. every worker gets its own pool, so the cores are split between them
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 1) // _PROCESSES)))
+)
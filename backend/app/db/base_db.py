@@ -1,25 +1,59 @@
+import asyncio
+from fastapi import Request
+from sqlalchemy import text
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession, create_async_engine
-
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://localhost:5432/pro_trader")
-
-db_async_engine = create_async_engine(DATABASE_URL, echo=True)
-async_db_session_local = async_sessionmaker(db_async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
-
-
-async def get_async_db_session():
-    async with async_db_session_local() as db_session:
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine, AsyncSession, create_async_engine
+from app.core.config import (
+    DATABASE_URL,
+    DB_ECHO,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_CACHE_SIZE,
+)
+
+
+def create_db_engine() -> AsyncEngine:
+    return create_async_engine(
+        DATABASE_URL,
+        echo=DB_ECHO,
+        # create_async_engine defaults to AsyncAdaptedQueuePool, the asyncio-safe queue pool
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args={
+            # sqlalchemy's prepared statement cache and asyncpg's own statement cache, per connection
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+
+
+def create_db_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+
+
+# engine and session factory are built in the app lifespan and live on app.state
+async def get_async_db_session(request: Request):
+    async with request.app.state.db_session_factory() as db_session:
         try:
             yield db_session
-        except:
+        except Exception:
             await db_session.rollback()
-        finally:
-            await db_session.aclose()
+            raise
+
+
+async def warm_db_pool(engine: AsyncEngine, size: int = DB_POOL_SIZE):
+    # open the pool's connections up front instead of on the first requests
+    async def _checkout():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_checkout() for _ in range(size)))
 
 
 class Base(DeclarativeBase):
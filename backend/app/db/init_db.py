@@ -0,0 +1,25 @@
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
+from app.db.base_db import Base, create_db_engine
+from app.models.user_model import user_email_lower_index  # also registers the user table on Base.metadata
+
+
+async def init_db():
+    # runs once before the workers start, the per-worker lifespan doesn't touch the schema
+    engine = create_db_engine()
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            # create_all skips tables that already exist, so older databases would never get
+            # the case-insensitive email guard. IF NOT EXISTS makes this a no-op once it's there
+            await conn.execute(CreateIndex(user_email_lower_index, if_not_exists=True))
+            # same for the id default: tables created before it have no default on id and every
+            # insert would fail NOT NULL. setting it again is harmless
+            await conn.execute(text('ALTER TABLE "user" ALTER COLUMN id SET DEFAULT gen_random_uuid()'))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(init_db())
@@ -0,0 +1,53 @@
+from typing import Any, Optional
+from uuid import UUID
+from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
+from sqlalchemy import func, lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.core.ttl_cache import TTLCache
+from app.models.user_model import User
+
+# emails known to be taken, so repeated signups for them skip the db.
+# only taken emails are cached, the insert itself stays the source of truth
+registered_emails = TTLCache(maxsize=10000, ttl=5)
+
+
+class UserDatabase(SQLAlchemyUserDatabase[User, Any]):
+    # get / get_by_email run on every authenticated request and login. lambda statements
+    # are built and cache-keyed once, later calls only bind the new value
+
+    async def get(self, id: UUID) -> Optional[User]:
+        return await self._get_user(lambda_stmt(lambda: select(User).where(User.id == id)))
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self._get_user(
+            lambda_stmt(
+                lambda: select(User).where(func.lower(User.email) == func.lower(email))
+            )
+        )
+
+    async def update(self, user: User, update_dict: dict[str, Any]) -> User:
+        if "email" in update_dict:
+            registered_emails.pop(user.email.lower())
+
+        for key, value in update_dict.items():
+            setattr(user, key, value)
+        self.session.add(user)
+        # nothing is generated on update and commit doesn't expire the instance, so no refresh
+        await self.session.commit()
+        return user
+
+    async def delete(self, user: User) -> None:
+        registered_emails.pop(user.email.lower())
+        await super().delete(user)
+
+    def email_recently_registered(self, email: str) -> bool:
+        # cache only, no query. a miss means nothing, create_if_new is still the real check
+        return registered_emails.get(email.lower()) is not None
+
+    async def create_if_new(self, create_dict: dict[str, Any]) -> Optional[User]:
+        # one INSERT for signup: the unique email indexes reject duplicates and we get None back
+        statement = pg_insert(User).values(**create_dict).on_conflict_do_nothing().returning(User)
+        user = await self.session.scalar(statement)
+        await self.session.commit()
+        registered_emails.set(create_dict["email"].lower(), True)
+        return user
@@ -1,22 +1,29 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.auth.jwt.auth_backend import auth_backend
 from app.auth.jwt.auth_user import auth_users
+from app.auth.password import create_password_pool
 from app.schema.user_schema import UserCreate, UserRead, UserUpdate
-from app.db.base_db import Base, db_async_engine
+from app.db.base_db import create_db_engine, create_db_session_factory, warm_db_pool
 from fastapi.middleware.cors import CORSMiddleware
 
 @asynccontextmanager
 async def lifespan(app : FastAPI):
-    # initialization of stuff
-    async with db_async_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # initialization of stuff, built here so each worker process owns its pool
+    app.state.db_engine = create_db_engine()
+    app.state.db_session_factory = create_db_session_factory(app.state.db_engine)
+    app.state.password_pool = create_password_pool()
+
+    # schema is created once by app.db.init_db (see run.py), not per worker
+    await warm_db_pool(app.state.db_engine)
     yield
 
-    await db_async_engine.dispose()
+    await app.state.db_engine.dispose()
+    app.state.password_pool.shutdown(cancel_futures=True)
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # cors
 app.add_middleware(
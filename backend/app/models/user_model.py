@@ -1,6 +1,17 @@
+import uuid
 from fastapi_users_db_sqlalchemy import SQLAlchemyBaseUserTableUUID
+from fastapi_users_db_sqlalchemy.generics import GUID
+from sqlalchemy import Index, func, text
+from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base_db import Base
 
 
 class User(SQLAlchemyBaseUserTableUUID, Base):
-    pass
+    # generated by postgres on insert and sent back with RETURNING, instead of uuid4() in python
+    id: Mapped[uuid.UUID] = mapped_column(
+        GUID, primary_key=True, server_default=text("gen_random_uuid()")
+    )
+
+
+# user lookups match on lower(email), which the plain email index can't serve
+user_email_lower_index = Index("ix_user_email_lower", func.lower(User.email), unique=True)
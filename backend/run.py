@@ -1,4 +1,11 @@
+import asyncio
 import uvicorn
+from app.core.config import RELOAD, WORKERS
+from app.db.init_db import init_db
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app",reload=True)
\ No newline at end of file
+    # schema setup happens here once, not in each worker's lifespan
+    asyncio.run(init_db())
+
+    # loop/http default to "auto", which picks uvloop and httptools from uvicorn[standard]
+    uvicorn.run("app.main:app", reload=RELOAD, workers=None if RELOAD else WORKERS)